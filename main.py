@@ -1,32 +1,101 @@
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, List
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import Dict, Any
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+import asyncio
+import time
 import os
+import importlib.util
+import sqlite3
+import threading
+from contextlib import closing
+import httpx
+import orjson
 from dotenv import load_dotenv
-# from providers import fetch_open_meteo, fetch_fisheries, fetch_noaa , fetch_obis , fetch_worms , fetch_bold, fetch_csv, fetch_ftp
 from providers.fetch_open_meteo import fetch_open_meteo
 from providers.fetch_csv import fetch_csv
 from providers.fetch_fisheries import fetch_fisheries
-from providers.fetch_noaa import fetch_noaa
+from providers.fetch_noaa import fetch_noaa, load_station_meta_cache, save_station_meta_cache
 from providers.fetch_obis import fetch_obis
 from providers.fetch_worms import fetch_worms
 from providers.fetch_bold import fetch_bold
 from providers.fetch_ftp import fetch_ftp
 from providers.fetch_cmfri import fetch_cmfri
+from models.data_models import (
+    OpenMeteoPayload, NoaaPayload, ObisPayload, WormsPayload, BoldPayload,
+    FisheriesPayload, CsvPayload, FtpPayload, CmfriPayload,
+)
 
 import datetime
-import requests 
 load_dotenv()
 
+INGEST_DB_PATH = os.environ.get("INGEST_DB_PATH", "ingest.db")
+MAX_PAGE_SIZE = 1000
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]"); fall back to HTTP/1.1 without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def open_database(path: str = INGEST_DB_PATH) -> sqlite3.Connection:
+    """Open the SQLite record store; each record is kept as its JSON body."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS records("
+        "id INTEGER PRIMARY KEY, provider TEXT, ts TEXT, body BLOB)"
+    )
+    return conn
+
+
+def _record_ts(record: Dict[str, Any]):
+    ts = record.get("timestamp")
+    return ts.isoformat() if isinstance(ts, datetime.datetime) else ts
+
+
+# The write connection is shared by ingest threads; one transaction at a time
+_db_write_lock = threading.Lock()
+
+
+def store_records(conn: sqlite3.Connection, provider: str, records) -> None:
+    """Encode and insert records in one transaction; blocking, so call it via asyncio.to_thread."""
+    rows = [
+        (provider, _record_ts(r), orjson.dumps(r, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+        for r in records
+    ]
+    with _db_write_lock, conn:
+        conn.executemany("INSERT INTO records(provider, ts, body) VALUES(?, ?, ?)", rows)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client per worker, shared by every provider (keep-alive reuse).
+    # httpx already sends Accept-Encoding for gzip/deflate (and br when brotli is installed);
+    # HTTP/2 adds header compression and lets concurrent requests share one connection.
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30,
+        follow_redirects=True,
+        http2=HTTP2_AVAILABLE,
+    )
+    app.state.db = open_database()
+    load_station_meta_cache()
+    yield
+    save_station_meta_cache()
+    await app.state.http.aclose()
+    app.state.db.close()
+
+
 app = FastAPI(
     title="Scalable Data Ingestion API",
     description="Backend to fetch and standardize data from multiple providers",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-database = []
-
 DATA_GOV_API_KEY = os.environ.get("DATA_GOV_API_KEY")
 
 PROVIDERS = {
@@ -35,22 +104,107 @@ PROVIDERS = {
     "obis": fetch_obis,
     "worms": fetch_worms, 
     "bold": fetch_bold ,
-    "fisheries": lambda payload: fetch_fisheries(payload, api_key=os.environ.get("DATA_GOV_API_KEY")),
+    "fisheries": lambda payload, client: fetch_fisheries(payload, client, api_key=os.environ.get("DATA_GOV_API_KEY")),
     "csv": fetch_csv,
     "ftp": fetch_ftp,
     "cmfri": fetch_cmfri,   
 }
 
+# Payload validators, built once at import so each request is a single validation pass
+PAYLOAD_ADAPTERS = {
+    "open-meteo": TypeAdapter(OpenMeteoPayload),
+    "noaa": TypeAdapter(NoaaPayload),
+    "obis": TypeAdapter(ObisPayload),
+    "worms": TypeAdapter(WormsPayload),
+    "bold": TypeAdapter(BoldPayload),
+    "fisheries": TypeAdapter(FisheriesPayload),
+    "csv": TypeAdapter(CsvPayload),
+    "ftp": TypeAdapter(FtpPayload),
+    "cmfri": TypeAdapter(CmfriPayload),
+}
+
+# Identical ingests share one upstream call: concurrent callers await the in-flight
+# future, and repeats within RECENT_TTL seconds are served from the recent results.
+RECENT_TTL = 60
+RECENT_MAX_SIZE = 1024
+_inflight: Dict[bytes, asyncio.Future] = {}
+_recent: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+
+def _recent_get(key: bytes):
+    entry = _recent.get(key)
+    if entry is None:
+        return None
+    expires, records = entry
+    if expires < time.monotonic():
+        del _recent[key]
+        return None
+    return records
+
+
+def _recent_set(key: bytes, records) -> None:
+    now = time.monotonic()
+    # Entries are in expiry order (constant TTL), so expired ones are always at the front
+    while _recent:
+        oldest_key, (expires, _) = next(iter(_recent.items()))
+        if expires >= now:
+            break
+        del _recent[oldest_key]
+
+    _recent[key] = (now + RECENT_TTL, records)
+    _recent.move_to_end(key)
+    if len(_recent) > RECENT_MAX_SIZE:
+        _recent.popitem(last=False)
+
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the fetching request is cancelled; followers retry."""
+
+
+async def _coalesced(key: bytes, fetch):
+    """Run fetch() once per key; returns (records, fresh) where fresh marks the caller that fetched."""
+    while True:
+        records = _recent_get(key)
+        if records is not None:
+            return records, False
+
+        pending = _inflight.get(key)
+        if pending is None:
+            break
+        try:
+            # shield: a disconnecting follower must not cancel the shared result
+            return await asyncio.shield(pending), False
+        except _LeaderCancelled:
+            continue  # the fetching request went away; take over or follow the next one
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        records = await fetch()
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved so an unawaited failure isn't logged
+        raise
+    except BaseException:
+        future.set_exception(_LeaderCancelled())
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+    future.set_result(records)
+    _recent_set(key, records)
+    return records, True
+
+
 # Request model
 class IngestRequest(BaseModel):
     provider: str
     payload: Dict[str, Any]
 
 
-from tools.cmfritool import scrape_technical_reports
-print(scrape_technical_reports("2023", limit=2))
 @app.post("/ingest/")
-def ingest(req: IngestRequest):
+async def ingest(req: IngestRequest, request: Request):
     provider = req.provider
     payload = req.payload
 
@@ -58,13 +212,44 @@ def ingest(req: IngestRequest):
         raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
 
     try:
-        records = PROVIDERS[provider](payload)
-        database.extend(records)
+        parsed = PAYLOAD_ADAPTERS[provider].validate_python(payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid payload for {provider}: {e}")
+
+    key = orjson.dumps({"p": provider, "payload": parsed.model_dump()}, option=orjson.OPT_SORT_KEYS)
+
+    try:
+        records, fresh = await _coalesced(key, lambda: PROVIDERS[provider](parsed, request.app.state.http))
+        # Only the caller that actually fetched stores the records
+        if fresh:
+            await asyncio.to_thread(store_records, request.app.state.db, provider, records)
         return {"status": "success", "records": records}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {e}")
 
 
-@app.get("/data/")
-def get_data() -> List[Dict[str, Any]]:
-    return database
+@app.get("/data/", response_model=None)
+def get_data(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+) -> Response:
+    # Reads use their own connection so they only ever see committed rows (WAL snapshot)
+    with closing(sqlite3.connect(INGEST_DB_PATH)) as conn:
+        rows = conn.execute(
+            "SELECT body FROM records ORDER BY id LIMIT ? OFFSET ?", (limit, offset)
+        ).fetchall()
+    # Bodies are stored as JSON already, so the page is stitched together without re-encoding
+    return Response(b"[" + b",".join(row[0] for row in rows) + b"]", media_type="application/json")
+
+
+@app.get("/health/")
+async def health(request: Request, check_upstream: bool = False):
+    status = {"status": "ok", "http2_enabled": HTTP2_AVAILABLE}
+    if check_upstream:
+        # Report the protocol actually negotiated with a provider (OBIS)
+        try:
+            r = await request.app.state.http.head("https://api.obis.org/v3/")
+            status["upstream_http_version"] = r.http_version
+        except httpx.HTTPError as e:
+            status["upstream_error"] = str(e)
+    return status
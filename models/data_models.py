@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Union
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List, Union
 import datetime
 
 class WeatherData(BaseModel):
@@ -24,4 +24,53 @@ class FisheriesData(BaseModel):
     inland_fish_production_lakh_tonnes: float
     total_exports_crores: float
     ingestion_timestamp: datetime.datetime
-    source: str
\ No newline at end of file
+    source: str
+
+# Provider payloads (validated once per ingest request)
+class OpenMeteoPayload(BaseModel):
+    latitude: float
+    longitude: float
+    hourly: List[str] = ["wave_height", "sea_surface_temperature"]
+
+class NoaaPayload(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    station: str = Field(min_length=1)
+    product: str = "water_temperature"
+    date: str | None = None
+    range: str | None = None
+    begin_date: str | None = None
+    end_date: str | None = None
+
+class ObisPayload(BaseModel):
+    endpoint: str = "occurrence"
+    params: Dict[str, Any] = {"size": 10}
+
+class WormsPayload(BaseModel):
+    endpoint: str = "AphiaRecordsByName"
+    params: Dict[str, Any] = {}
+    limit: int = 100
+
+class BoldPayload(BaseModel):
+    endpoint: str = "specimen"
+    params: Dict[str, Any] = {}
+
+class FisheriesPayload(BaseModel):
+    pass
+
+class CsvPayload(BaseModel):
+    url: str | None = None
+    path: str | None = None
+
+class FtpPayload(BaseModel):
+    host: str = Field(min_length=1)
+    user: str = "anonymous"
+    passwd: str = "anonymous@"
+    filepath: str = Field(min_length=1)
+    filetype: str = "csv"
+
+class CmfriPayload(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    year: str = "2023"
+    limit: int = 1
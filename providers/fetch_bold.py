@@ -2,27 +2,28 @@
 import datetime
 from typing import Dict, Any, List
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import httpx
+import orjson
+from models.data_models import StandardizedRecord, BoldPayload
 from fastapi import HTTPException
 
-def fetch_bold(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def fetch_bold(payload: BoldPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     """
     Fetch specimen or sequence data from BOLD Systems API.
     Example payload:
       {"endpoint": "specimen", "params": {"taxon": "Gadus", "format": "json", "limit": 10}}
     """
-    endpoint = payload.get("endpoint", "specimen")
-    params = payload.get("params", {})
+    endpoint = payload.endpoint
+    params = payload.params
     base = "http://www.boldsystems.org/index.php/API_Public"
     url = f"{base}/{endpoint}"
 
     # Pop limit if user passed it, default 20
     limit = int(params.pop("limit", 20))
 
-    r = requests.get(url, params=params, timeout=30)
+    r = await client.get(url, params=params)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
 
     records = []
     if isinstance(data, dict):
@@ -36,6 +37,10 @@ def fetch_bold(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     # Apply client-side limit
     records = records[:limit]
 
+    # All rows in a batch share the ingestion timestamp
+    timestamp = datetime.datetime.now().isoformat()
+    source = f"bold/{endpoint}"
+
     return [{
         "processid": item.get("processid"),
         "species_name": item.get("species_name"),
@@ -43,6 +48,6 @@ def fetch_bold(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         "lon": item.get("lon"),
         "marker": item.get("marker"),
         "genbank_accession": item.get("genbank_accession"),
-        "timestamp": datetime.datetime.now().isoformat(),
-        "source": f"bold/{endpoint}"
+        "timestamp": timestamp,
+        "source": source,
     } for item in records]
\ No newline at end of file
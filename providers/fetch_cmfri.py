@@ -1,30 +1,106 @@
 from tools.cmfritool import scrape_technical_reports, download_pdf
-from tools.parsetool import extract_text, extract_tables
+from tools.parsetool import extract_text_and_tables
 import re
+import os
+import asyncio
+import hashlib
+import pickle
+import tempfile
+import httpx
+from models.data_models import CmfriPayload
+
+CACHE_DIR = os.path.join("cmfri_reports", ".cache")
+
+SECTION_KEYWORD = re.compile(r"Introduction|Methodology|Results|Discussion|Conclusion")
+
 
 def split_sections(text: str):
     """Very simple section splitter based on report keywords."""
+    # Find each keyword and widen it to its whole line; sections are the slices between lines
+    headings = []
+    pos = 0
+    while True:
+        m = SECTION_KEYWORD.search(text, pos)
+        if m is None:
+            break
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = text.find("\n", m.end())
+        if end == -1:
+            end = len(text)
+        headings.append((start, end))
+        pos = end
+
     sections = {}
-    patterns = ["Introduction", "Methodology", "Results", "Discussion", "Conclusion"]
-    last = None
-    buffer = []
-
-    for line in text.split("\n"):
-        if any(p in line for p in patterns):
-            if last:
-                sections[last] = " ".join(buffer).strip()
-                buffer = []
-            last = line.strip()
-        else:
-            buffer.append(line)
+    for i, (start, end) in enumerate(headings):
+        body_end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+        sections[text[start:end].strip()] = text[end:body_end].replace("\n", " ").strip()
+    return sections
 
-    if last:
-        sections[last] = " ".join(buffer).strip()
 
-    return sections
+def _cache_path(pdf_url: str) -> str:
+    key = hashlib.sha1(pdf_url.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+
+def _load_cached(pdf_url: str):
+    """Return cached (text, tables) for a report URL, or None on a miss."""
+    path = _cache_path(pdf_url)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None  # corrupt/stale entry → re-parse
+
 
+def _store_cached(pdf_url: str, text, tables):
+    # extract_tables reports Camelot failures as [{"error": ...}]; don't pin a transient failure
+    if any(isinstance(table, dict) and "error" in table for table in tables):
+        return
 
-def fetch_cmfri(payload):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(pdf_url)
+    # Unique temp file per writer: several workers may parse the same report at once
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((text, tables), f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+async def _process_report(client: httpx.AsyncClient, pdf_url: str, year, semaphore: asyncio.Semaphore):
+    """Download (or load from cache) and parse a single report into a record."""
+    async with semaphore:
+        # Parsed outputs are cached per URL; on a hit skip download + parse entirely
+        cached = _load_cached(pdf_url)
+        if cached is not None:
+            text, tables = cached
+        else:
+            report = await download_pdf(client, pdf_url)
+            # One pdfplumber pass for both text and tables, off the event loop
+            text, tables = await asyncio.to_thread(extract_text_and_tables, report["file"])
+            _store_cached(pdf_url, text, tables)
+    sections = split_sections(text)
+
+    return {
+        "provider": "cmfri_pdf",
+        "year": year,
+        "report_name": pdf_url.split("/")[-1],
+        "source_url": pdf_url,
+        "metadata": {
+            "pages": text.count("\f") + 1,  # rough page count
+            "length_chars": len(text),
+        },
+        "sections": sections,
+        "tables": tables,
+    }
+
+
+async def fetch_cmfri(payload: CmfriPayload, client: httpx.AsyncClient):
     """
     Fetch and process CMFRI Technical Reports.
     payload can contain:
@@ -33,30 +109,14 @@ def fetch_cmfri(payload):
         "limit": 1
     }
     """
-    year = payload.get("year", "2023")
-    limit = payload.get("limit", 1)
-
-    pdf_links = scrape_technical_reports(year=year, limit=limit)
-
-    records = []
-    for pdf_url in pdf_links:
-        report = download_pdf(pdf_url)
-        text = extract_text(report["file"])
-        tables = extract_tables(report["file"])
-        sections = split_sections(text)
-
-        record = {
-            "provider": "cmfri_pdf",
-            "year": year,
-            "report_name": report["file"].split("/")[-1],
-            "source_url": report["url"],
-            "metadata": {
-                "pages": text.count("\f") + 1,  # rough page count
-                "length_chars": len(text),
-            },
-            "sections": sections,
-            "tables": tables,
-        }
-        records.append(record)
-
-    return records
+    year = payload.year
+    limit = payload.limit
+
+    pdf_links = await scrape_technical_reports(client, year=year, limit=limit)
+
+    # Reports are processed in parallel, bounded by the number of cores
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+    records = await asyncio.gather(
+        *(_process_report(client, pdf_url, year, semaphore) for pdf_url in pdf_links)
+    )
+    return list(records)
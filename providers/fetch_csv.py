@@ -1,14 +1,14 @@
 import datetime
 from typing import Dict, Any, List
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import httpx
+from models.data_models import StandardizedRecord, CsvPayload
 from fastapi import HTTPException
 import pandas as pd
 from io import StringIO
 # from providers.fetch_csv import fetch_csv
 
-def fetch_csv(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def fetch_csv(payload: CsvPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     """
     Fetch and standardize data from a CSV file.
     Example payloads:
@@ -16,12 +16,12 @@ def fetch_csv(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
       {"url": "https://example.com/fisheries.csv"}
     """
     try:
-        if "url" in payload:
-            r = requests.get(payload["url"], timeout=30)
+        if payload.url:
+            r = await client.get(payload.url)
             r.raise_for_status()
             df = pd.read_csv(StringIO(r.text))
-        elif "path" in payload:
-            df = pd.read_csv(payload["path"])
+        elif payload.path:
+            df = pd.read_csv(payload.path)
         else:
             raise ValueError("Payload must include either 'url' or 'path' for CSV source.")
 
@@ -1,41 +1,75 @@
+import asyncio
 import datetime
 from typing import Dict, Any, List
 import os 
-import requests
+import httpx
+import orjson
 from models.data_models import StandardizedRecord
 from fastapi import HTTPException
-from models.data_models import FisheriesData
+from models.data_models import FisheriesPayload
+
+FISHERIES_URL = "https://api.data.gov.in/resource/a66f8149-d060-43f9-bc94-e9daeb2c0188"
+PAGE_SIZE = 100
+MAX_CONCURRENT_PAGES = 10  # stay well under data.gov.in rate limits
+
+
+async def _fetch_page(client: httpx.AsyncClient, api_key: str, offset: int) -> Dict[str, Any]:
+    params = {"api-key": api_key, "format": "json", "limit": PAGE_SIZE, "offset": offset}
+    response = await client.get(FISHERIES_URL, params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def _standardize(items: List[Dict[str, Any]], ingestion_timestamp: datetime.datetime) -> List[Dict[str, Any]]:
+    records = []
+    for item in items:
+        # Plain dict in the FisheriesData shape; float() still rejects malformed rows
+        try:
+            records.append({
+                "year": str(item.get("financial_year", "N/A")),
+                "total_fish_production_lakh_tonnes": float(item.get("total_fish_production_lakh_tonnes", 0)),
+                "marine_fish_production_lakh_tonnes": float(item.get("marine_fish_production_lakh_tonnes", 0)),
+                "inland_fish_production_lakh_tonnes": float(item.get("inland_fish_production_lakh_tonnes", 0)),
+                "total_exports_crores": float(item.get("total_exports_crores", 0)),
+                "ingestion_timestamp": ingestion_timestamp,
+                "source": "data.gov.in",
+            })
+        except (TypeError, ValueError):
+            continue
+    return records
+
+
+async def fetch_fisheries(payload: FisheriesPayload, client: httpx.AsyncClient, api_key: str) -> List[Dict[str, Any]]:
+    ingestion_timestamp = datetime.datetime.now()
+
+    # Probe the first page; data.gov.in reports the total row count alongside it
+    first = await _fetch_page(client, api_key, 0)
+    pages = [first]
+
+    try:
+        total = int(first["total"])
+    except (KeyError, TypeError, ValueError):
+        total = None
+
+    if total is not None:
+        # Known size → fetch the remaining pages concurrently, bounded by a semaphore
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def bounded_page(offset: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await _fetch_page(client, api_key, offset)
+
+        pages += await asyncio.gather(
+            *(bounded_page(offset) for offset in range(PAGE_SIZE, total, PAGE_SIZE))
+        )
+    else:
+        # No total reported → walk pages serially until an empty one
+        offset = PAGE_SIZE
+        while pages[-1].get("records"):
+            pages.append(await _fetch_page(client, api_key, offset))
+            offset += PAGE_SIZE
 
-def fetch_fisheries(payload: dict, api_key: str) -> List[Dict[str, Any]]:
-    url = "https://api.data.gov.in/resource/a66f8149-d060-43f9-bc94-e9daeb2c0188"
     all_records = []
-    offset = 0
-    limit = 100
-
-    while True:
-        params = {"api-key": api_key, "format": "json", "limit": limit, "offset": offset}
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        if "records" not in data or not data["records"]:
-            break
-
-        for item in data["records"]:
-            try:
-                standardized_data = FisheriesData(
-                    year=item.get("financial_year", "N/A"),
-                    total_fish_production_lakh_tonnes=float(item.get("total_fish_production_lakh_tonnes", 0)),
-                    marine_fish_production_lakh_tonnes=float(item.get("marine_fish_production_lakh_tonnes", 0)),
-                    inland_fish_production_lakh_tonnes=float(item.get("inland_fish_production_lakh_tonnes", 0)),
-                    total_exports_crores=float(item.get("total_exports_crores", 0)),
-                    ingestion_timestamp=datetime.datetime.now(),
-                    source="data.gov.in",
-                ).model_dump()
-                all_records.append(standardized_data)
-            except Exception:
-                continue
-
-        offset += limit
-
-    return all_records
\ No newline at end of file
+    for data in pages:
+        all_records.extend(_standardize(data.get("records") or [], ingestion_timestamp))
+    return all_records
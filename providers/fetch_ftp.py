@@ -1,13 +1,28 @@
+import asyncio
 import datetime
 from typing import Dict, Any, List
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import httpx
+from models.data_models import StandardizedRecord, CsvPayload, FtpPayload
 from fastapi import HTTPException
 from ftplib import FTP
 import os
+from providers.fetch_csv import fetch_csv
 
-def fetch_ftp(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+
+def _retrieve_file(host: str, user: str, passwd: str, filepath: str) -> str:
+    """Blocking FTP download; run in a worker thread to keep the event loop free."""
+    ftp = FTP(host)
+    ftp.login(user=user, passwd=passwd)
+    local_filename = os.path.basename(filepath)
+
+    with open(local_filename, "wb") as f:
+        ftp.retrbinary(f"RETR {filepath}", f.write)
+    ftp.quit()
+    return local_filename
+
+
+async def fetch_ftp(payload: FtpPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     """
     Fetch file(s) from an FTP server and standardize.
     Example payload:
@@ -19,27 +34,18 @@ def fetch_ftp(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         "filetype": "csv"
       }
     """
-    host = payload.get("host")
-    user = payload.get("user", "anonymous")
-    passwd = payload.get("passwd", "anonymous@")
-    filepath = payload.get("filepath")
-    filetype = payload.get("filetype", "csv")
-
-    if not host or not filepath:
-        raise HTTPException(status_code=400, detail="Missing 'host' or 'filepath' for FTP fetcher.")
+    host = payload.host
+    user = payload.user
+    passwd = payload.passwd
+    filepath = payload.filepath
+    filetype = payload.filetype
 
     try:
-        ftp = FTP(host)
-        ftp.login(user=user, passwd=passwd)
-        local_filename = os.path.basename(filepath)
-
-        with open(local_filename, "wb") as f:
-            ftp.retrbinary(f"RETR {filepath}", f.write)
-        ftp.quit()
+        local_filename = await asyncio.to_thread(_retrieve_file, host, user, passwd, filepath)
 
         # Once file is downloaded → delegate to appropriate parser
         if filetype == "csv":
-            return fetch_csv({"path": local_filename})
+            return await fetch_csv(CsvPayload(path=local_filename), client)
         else:
             raise ValueError(f"Unsupported filetype from FTP: {filetype}")
 
@@ -1,12 +1,75 @@
 import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import pickle
+import tempfile
+from collections import OrderedDict
+import httpx
+import orjson
+from models.data_models import NoaaPayload
 from fastapi import HTTPException
 
+STATION_META_CACHE_FILE = os.path.expanduser("~/.cache/noaa_meta.pkl")
+STATION_META_CACHE_SIZE = 1024
 
-def fetch_noaa(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+# station id -> (lat, lon); LRU-ordered, shared by all requests in this worker
+_station_meta: "OrderedDict[str, Tuple[Any, Any]]" = OrderedDict()
+
+
+def load_station_meta_cache(path: str = STATION_META_CACHE_FILE) -> None:
+    """Restore station metadata saved by a previous worker, if any."""
+    try:
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        # Skip coordinate-less entries written before failed lookups were filtered out
+        _station_meta.update((k, v) for k, v in saved.items() if v != (None, None))
+    except Exception:
+        pass  # missing or unreadable cache → start empty
+
+
+def save_station_meta_cache(path: str = STATION_META_CACHE_FILE) -> None:
+    """Persist station metadata so it survives worker restarts."""
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Unique temp file per process: several workers may save at shutdown at once
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(dict(_station_meta), f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+async def _noaa_station_meta(station: str, client: httpx.AsyncClient) -> Optional[Tuple[Any, Any]]:
+    """Return (lat, lon) for a station, hitting the metadata API only on a cache miss."""
+    if station in _station_meta:
+        _station_meta.move_to_end(station)
+        return _station_meta[station]
+
+    try:
+        meta_url = f"https://api.tidesandcurrents.noaa.gov/mdapi/prod/webapi/stations/{station}/metadata.json"
+        meta_resp = await client.get(meta_url, timeout=10)
+        meta_resp.raise_for_status()
+        meta_data = orjson.loads(meta_resp.content).get("stations", [{}])[0]
+    except Exception:
+        return None  # don't cache failures, retry on the next ingest
+
+    coords = (meta_data.get("lat"), meta_data.get("lng"))
+    if coords == (None, None):
+        return None  # unknown station / error payload → not cached either
+
+    _station_meta[station] = coords
+    if len(_station_meta) > STATION_META_CACHE_SIZE:
+        _station_meta.popitem(last=False)
+    return _station_meta[station]
+
+
+async def fetch_noaa(payload: NoaaPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     """
     Fetch data from NOAA Tides & Currents API with extended support.
     Example payload:
@@ -17,15 +80,11 @@ def fetch_noaa(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         "end_date": "20250105"
     }
     """
-    import requests
     import datetime
     from fastapi import HTTPException
 
-    station = payload.get("station")
-    product = payload.get("product", "water_temperature")
-
-    if not station:
-        raise HTTPException(status_code=400, detail="Missing 'station' in payload")
+    station = payload.station
+    product = payload.product
 
     VALID_PRODUCTS = {
         "water_level", "water_temperature", "air_temperature", "wind", "air_pressure",
@@ -47,12 +106,13 @@ def fetch_noaa(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     # Add date parameters dynamically
     for key in ["date", "range", "begin_date", "end_date"]:
-        if key in payload:
-            params[key] = payload[key]
+        value = getattr(payload, key)
+        if value is not None:
+            params[key] = value
 
-    r = requests.get(url, params=params, timeout=30)
+    r = await client.get(url, params=params)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
 
     if "data" not in data or not data["data"]:
         raise HTTPException(status_code=404, detail="No data found from NOAA")
@@ -60,31 +120,22 @@ def fetch_noaa(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     # Optional metadata enrichment
     meta = data.get("metadata", {})
     if not meta:
-        try:
-            meta_url = f"https://api.tidesandcurrents.noaa.gov/mdapi/prod/webapi/stations/{station}/metadata.json"
-            meta_resp = requests.get(meta_url, timeout=10)
-            meta_data = meta_resp.json().get("stations", [{}])[0]
-            meta["lat"] = meta_data.get("lat")
-            meta["lon"] = meta_data.get("lng")
-        except Exception:
-            pass  # fallback to empty metadata
-
-    records = []
-    for item in data["data"]:
-        raw_time = item["t"].replace(" ", "T")
-        try:
-            timestamp = datetime.datetime.fromisoformat(raw_time)
-        except ValueError:
-            timestamp = datetime.datetime.strptime(raw_time, "%Y-%m-%dT%H:%M:%S")
-
-        records.append(StandardizedRecord(
-            station=station,
-            latitude=meta.get("lat"),
-            longitude=meta.get("lon"),
-            parameter=product,
-            value=float(item["v"]),
-            timestamp=timestamp,
-            source="NOAA"
-        ).model_dump())
-
-    return records
\ No newline at end of file
+        coords = await _noaa_station_meta(station, client)
+        if coords:
+            meta["lat"], meta["lon"] = coords
+
+    # NOAA "t" is "YYYY-MM-DD HH:MM", which fromisoformat parses as-is
+    # datagetter metadata reports lat/lon as strings; coerce as StandardizedRecord did
+    lat, lon = meta.get("lat"), meta.get("lon")
+    lat = float(lat) if lat is not None else None
+    lon = float(lon) if lon is not None else None
+    parse_time = datetime.datetime.fromisoformat
+    return [{
+        "latitude": lat,
+        "longitude": lon,
+        "station": station,
+        "parameter": product,
+        "value": float(item["v"]),
+        "timestamp": parse_time(item["t"]),
+        "source": "NOAA",
+    } for item in data["data"]]
\ No newline at end of file
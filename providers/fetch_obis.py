@@ -1,11 +1,12 @@
 import datetime
 from typing import Dict, Any, List
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import httpx
+import orjson
+from models.data_models import StandardizedRecord, ObisPayload
 from fastapi import HTTPException
 
-def fetch_obis(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def fetch_obis(payload: ObisPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     """
     Fetch species occurrence data from OBIS API.
     Tailored for ocean biodiversity monitoring (CMLRE-style).
@@ -14,38 +15,32 @@ def fetch_obis(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
       {"endpoint": "occurrence", "params": {"scientificname": "Sardinella", "size": 10}}
       {"endpoint": "occurrence", "params": {"taxonid": 12345, "size": 20}}
     """
-    endpoint = payload.get("endpoint", "occurrence")
-    params = payload.get("params", {"size": 10})
+    endpoint = payload.endpoint
+    params = payload.params
     base = "https://api.obis.org/v3"
     url = f"{base}/{endpoint}"
 
-    r = requests.get(url, params=params, timeout=30)
+    r = await client.get(url, params=params)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
 
     items = data.get("results", data.get("data", []))
-    records = []
 
-    for item in items:
-        lat = item.get("decimalLatitude")
-        lon = item.get("decimalLongitude")
+    # All rows in a batch share the ingestion timestamp
+    timestamp = datetime.datetime.now().isoformat()
+    source = f"obis/{endpoint}"
 
-        # Build structured record
-        record = {
-            "latitude": lat,
-            "longitude": lon,
-            "species": item.get("scientificName"),
-            "taxonRank": item.get("taxonRank"),
-            "family": item.get("family"),
-            "order": item.get("order"),
-            "class": item.get("class"),
-            "basisOfRecord": item.get("basisOfRecord"),  # e.g., HumanObservation
-            "depth": item.get("depth"),
-            "eventDate": item.get("eventDate"),
-            "timestamp": datetime.datetime.now().isoformat(),
-            "source": f"obis/{endpoint}"
-        }
-
-        records.append(record)
-
-    return records 
\ No newline at end of file
+    return [{
+        "latitude": item.get("decimalLatitude"),
+        "longitude": item.get("decimalLongitude"),
+        "species": item.get("scientificName"),
+        "taxonRank": item.get("taxonRank"),
+        "family": item.get("family"),
+        "order": item.get("order"),
+        "class": item.get("class"),
+        "basisOfRecord": item.get("basisOfRecord"),  # e.g., HumanObservation
+        "depth": item.get("depth"),
+        "eventDate": item.get("eventDate"),
+        "timestamp": timestamp,
+        "source": source,
+    } for item in items] 
\ No newline at end of file
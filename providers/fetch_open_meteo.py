@@ -1,11 +1,11 @@
-import datetime
 from typing import Dict, Any, List
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import httpx
+import orjson
+from models.data_models import OpenMeteoPayload
 from fastapi import HTTPException
 
-def fetch_open_meteo(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def fetch_open_meteo(payload: OpenMeteoPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     """
     Fetch marine/oceanographic data from Open-Meteo.
     Example payload:
@@ -17,17 +17,17 @@ def fetch_open_meteo(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     url = "https://marine-api.open-meteo.com/v1/marine"
     params = {
-        "latitude": payload.get("latitude"),
-        "longitude": payload.get("longitude"),
-        "hourly": ",".join(payload.get("hourly", ["wave_height", "sea_surface_temperature" ])),
+        "latitude": payload.latitude,
+        "longitude": payload.longitude,
+        "hourly": ",".join(payload.hourly),
     }
 
-    r = requests.get(url, params=params, timeout=30)
+    r = await client.get(url, params=params)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
 
     records = []
-    lat, lon = payload.get("latitude"), payload.get("longitude")
+    lat, lon = payload.latitude, payload.longitude
     timestamps = data.get("hourly", {}).get("time", [])
 
     for param in params["hourly"].split(","):
@@ -35,12 +35,14 @@ def fetch_open_meteo(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         for t, v in zip(timestamps, values):
             if v is None:  # skip missing values
                 continue
-            records.append(StandardizedRecord(
-                latitude=lat,
-                longitude=lon,
-                parameter=param,
-                value=v,
-                timestamp=datetime.datetime.fromisoformat(t),
-                source="open-meteo"
-            ).model_dump())
+            # Plain dict in the StandardizedRecord shape (no per-row validation)
+            records.append({
+                "latitude": lat,
+                "longitude": lon,
+                "station": None,
+                "parameter": param,
+                "value": v,
+                "timestamp": t,
+                "source": "open-meteo",
+            })
     return records
\ No newline at end of file
@@ -1,15 +1,16 @@
 import datetime
 from typing import Dict, Any, List
 import os 
-import requests
-from models.data_models import StandardizedRecord
+import httpx
+import orjson
+from models.data_models import StandardizedRecord, WormsPayload
 from fastapi import HTTPException
 
 
-def fetch_worms(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    endpoint = payload.get("endpoint", "AphiaRecordsByName")
-    params = payload.get("params", {})
-    limit = payload.get("limit", 100)  # default cap at 100
+async def fetch_worms(payload: WormsPayload, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
+    endpoint = payload.endpoint
+    params = payload.params
+    limit = payload.limit  # default cap at 100
     base = "https://www.marinespecies.org/rest"
 
     # Build endpoint-specific URL
@@ -24,9 +25,9 @@ def fetch_worms(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     else:
         raise ValueError("WoRMS requires either 'scientificname' or 'AphiaID' in params")
 
-    r = requests.get(url, params=params, timeout=30)
+    r = await client.get(url, params=params)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
 
     # ✅ Case 1: API just returns an integer (e.g., AphiaIDByName)
     if isinstance(data, int):
@@ -1,49 +1,85 @@
+import asyncio
 import os
-import requests
+import tempfile
+import httpx
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from email.utils import formatdate
 
 EPRINTS_BASE = "https://eprints.cmfri.org.in/"
+CHUNK_SIZE = 64 * 1024
 
-def scrape_technical_reports(year="2023", limit=5):
+async def scrape_technical_reports(client: httpx.AsyncClient, year="2023", limit=5):
     """Scrape CMFRI 'Marine Fish Landings' technical report PDFs for a given year."""
     url = f"{EPRINTS_BASE}view/year/{year}.html"
-    r = requests.get(url)
+    r = await client.get(url)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-
-    pdf_links = []
-    count = 0
+    soup = BeautifulSoup(r.text, "lxml")
 
     # Step 1: find record pages
-    for link in soup.find_all("a", href=True):
-        href = link['href']
-        text = link.get_text(strip=True)
+    record_urls = [
+        urljoin(EPRINTS_BASE, a['href'])
+        for a in soup.select("a[href]")
+        if "Marine Fish Landings" in a.get_text(strip=True)  # filter relevant reports
+    ]
 
-        if "Marine Fish Landings" in text:  # filter relevant reports
-            record_url = urljoin(EPRINTS_BASE, href)
+    # Step 2: visit record pages concurrently, one batch at a time → find actual PDF links.
+    # Records without a PDF don't count towards the limit, so keep going until it is met.
+    pdf_links = []
+    start = 0
+    while len(pdf_links) < limit and start < len(record_urls):
+        batch = record_urls[start:start + limit - len(pdf_links)]
+        start += len(batch)
+        pages = await asyncio.gather(*(client.get(u) for u in batch))
 
-            # Step 2: visit record page → find actual PDF link
-            record_res = requests.get(record_url)
+        for record_res in pages:
             record_res.raise_for_status()
-            record_soup = BeautifulSoup(record_res.text, "html.parser")
+            record_soup = BeautifulSoup(record_res.text, "lxml")
 
-            for pdf_link in record_soup.find_all("a", href=True):
-                if pdf_link['href'].endswith(".pdf"):
-                    pdf_links.append(urljoin(EPRINTS_BASE, pdf_link['href']))
-                    count += 1
-                    break  # take first PDF per record
+            pdf_link = record_soup.select_one('a[href$=".pdf"]')  # take first PDF per record
+            if pdf_link:
+                pdf_links.append(urljoin(EPRINTS_BASE, pdf_link['href']))
 
-        if count >= limit:
-            break
+    return pdf_links[:limit]
 
-    return pdf_links
-
-def download_pdf(url, folder="cmfri_reports"):
+async def download_pdf(client: httpx.AsyncClient, url, folder="cmfri_reports"):
+    """Stream a PDF to disk, skipping the transfer if the server says it is unchanged."""
     os.makedirs(folder, exist_ok=True)
     filename = os.path.join(folder, url.split("/")[-1])
-    r = requests.get(url)
-    r.raise_for_status()
-    with open(filename, "wb") as f:
-        f.write(r.content)
+    etag_file = filename + ".etag"
+
+    # Conditional request: reuse the local copy on 304 Not Modified
+    headers = {}
+    if os.path.exists(filename):
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(filename), usegmt=True)
+        if os.path.exists(etag_file):
+            with open(etag_file) as f:
+                headers["If-None-Match"] = f.read().strip()
+
+    async with client.stream("GET", url, headers=headers) as r:
+        if r.status_code == 304:
+            return {"file": filename, "url": url}
+        r.raise_for_status()
+
+        # Write to a unique temp file so an interrupted download never replaces a good copy
+        # and overlapping downloads of the same report never share a file
+        fd, tmp_filename = tempfile.mkstemp(dir=folder, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in r.aiter_bytes(CHUNK_SIZE):
+                    f.write(chunk)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+
+        # Only record the ETag once the file it describes is in place
+        etag = r.headers.get("ETag")
+        if etag:
+            with open(etag_file, "w") as f:
+                f.write(etag)
+        elif os.path.exists(etag_file):
+            os.remove(etag_file)
+
     return {"file": filename, "url": url}
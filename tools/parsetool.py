@@ -7,16 +7,6 @@ from fastapi import HTTPException
 import pdfplumber
 import camelot
 
-def extract_text(pdf_file):
-    """Extract text from a PDF file."""
-    text_content = []
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                text_content.append(text)
-    return " ".join(text_content)
-
 def extract_tables(pdf_file):
     """Extract tables using Camelot."""
     try:
@@ -24,3 +14,28 @@ def extract_tables(pdf_file):
         return [table.df.to_dict(orient="records") for table in tables]
     except Exception as e:
         return [{"error": str(e)}]
+
+def _rows_to_records(table):
+    """Turn a pdfplumber table (list of rows, first row = header) into dict records."""
+    header = [cell if cell else str(i) for i, cell in enumerate(table[0])]
+    return [dict(zip(header, row)) for row in table[1:]]
+
+def extract_text_and_tables(pdf_file):
+    """Extract text and tables in a single pdfplumber pass.
+
+    Falls back to Camelot (lattice mode) only when pdfplumber finds no tables at all.
+    """
+    text_content = []
+    tables = []
+    with pdfplumber.open(pdf_file) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text:
+                text_content.append(text)
+            for table in page.extract_tables() or []:
+                if table:
+                    tables.append(_rows_to_records(table))
+
+    if not tables:
+        tables = extract_tables(pdf_file)
+    return " ".join(text_content), tables